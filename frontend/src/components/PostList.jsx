@@ -23,10 +23,25 @@ const PostList = () => {
     }
   };
 
+  const applyReaction = (postId, data) => {
+    setPosts((current) =>
+      current.map((post) =>
+        post.id === postId
+          ? {
+              ...post,
+              likes_count: data.likes_count,
+              dislikes_count: data.dislikes_count,
+              user_reaction: data.user_reaction,
+            }
+          : post
+      )
+    );
+  };
+
   const handleLike = async (postId) => {
     try {
-      await axios.post(`/posts/${postId}/like/`);
-      fetchPosts();
+      const response = await axios.post(`/posts/${postId}/like/`);
+      applyReaction(postId, response.data);
     } catch (err) {
       console.error('Error liking post:', err);
     }
@@ -34,8 +49,8 @@ const PostList = () => {
 
   const handleDislike = async (postId) => {
     try {
-      await axios.post(`/posts/${postId}/dislike/`);
-      fetchPosts();
+      const response = await axios.post(`/posts/${postId}/dislike/`);
+      applyReaction(postId, response.data);
     } catch (err) {
       console.error('Error disliking post:', err);
     }
@@ -0,0 +1,5 @@
+def post_worker_init(worker):
+    # Runs in each worker after the application is loaded (and after the fork
+    # when --preload is used), so the primed connections belong to the worker.
+    from users.warmup import prime_database_connections
+    prime_database_connections()
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'users.middleware.DatabaseLatencyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -51,6 +52,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'social_network.wsgi.application'
 
+WARMUP_ON_STARTUP = config('WARMUP_ON_STARTUP', default=True, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
@@ -59,6 +62,27 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+    }
+}
+
+SHARD_DATABASES = config('SHARD_DATABASES', default='', cast=Csv())
+RETIRED_SHARD_DATABASES = config('RETIRED_SHARD_DATABASES', default='', cast=Csv())
+
+for alias in SHARD_DATABASES + RETIRED_SHARD_DATABASES:
+    if alias != 'default':
+        DATABASES[alias] = {
+            **DATABASES['default'],
+            'NAME': config(f'DB_{alias.upper()}_NAME', default=f"{DATABASES['default']['NAME']}_{alias}"),
+            'HOST': config(f'DB_{alias.upper()}_HOST', default=DATABASES['default']['HOST']),
+        }
+
+DATABASE_ROUTERS = ['users.sharding.ShardRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='social-network'),
     }
 }
 
@@ -79,6 +103,29 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'users.throttling.LoadSheddingThrottle',
+        'users.throttling.UserTokenBucketThrottle',
+        'users.throttling.IPTokenBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': config('THROTTLE_SIGNUP_IP', default='5/min'),
+        'login_ip': config('THROTTLE_LOGIN_IP', default='10/min'),
+        'reaction': config('THROTTLE_REACTION', default='60/min'),
+        'reaction_ip': config('THROTTLE_REACTION_IP', default='300/min'),
+        'reaction_state': config('THROTTLE_REACTION_STATE', default='120/min'),
+    },
+}
+
+LOAD_SHEDDING = {
+    'ENABLED': config('LOAD_SHEDDING_ENABLED', default=True, cast=bool),
+    'THRESHOLDS_MS': {
+        'low': config('LOAD_SHEDDING_LOW_MS', default=150, cast=int),
+        'normal': config('LOAD_SHEDDING_NORMAL_MS', default=400, cast=int),
+    },
+    'RETRY_AFTER': config('LOAD_SHEDDING_RETRY_AFTER', default=5, cast=int),
+    'SMOOTHING': 0.2,
+    'SAMPLE_WINDOW': 10,
 }
 
 from datetime import timedelta
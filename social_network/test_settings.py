@@ -0,0 +1,9 @@
+from .settings import *  # noqa: F401,F403
+
+# The sharding tests spread rows over these extra databases; each test picks
+# the shards it uses with override_settings(SHARD_DATABASES=...).
+for alias in ('shard1', 'shard2'):
+    DATABASES.setdefault(alias, {
+        **DATABASES['default'],
+        'NAME': f"{DATABASES['default']['NAME']}_{alias}",
+    })
@@ -1,6 +1,69 @@
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.http import QueryDict
 from .models import User, Post, Reaction
+from .sharding import get_shard_aliases, pin_shard, shard_for_post
+
+
+class ShardListFilter(admin.SimpleListFilter):
+    title = 'shard'
+    parameter_name = 'shard'
+    
+    def lookups(self, request, model_admin):
+        return [(alias, alias) for alias in get_shard_aliases()]
+    
+    def value(self):
+        # There is no "all shards" view; the first shard is shown by default.
+        return super().value() or get_shard_aliases()[0]
+    
+    def choices(self, changelist):
+        return list(super().choices(changelist))[1:]
+    
+    def queryset(self, request, queryset):
+        # The changelist is already pinned to this shard.
+        return queryset
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    # Shows one shard at a time, picked with the shard filter. The admin
+    # views query through the router without a hint, so each view is pinned
+    # to the shard it works on.
+    actions = None
+    list_select_related = ()
+    
+    def get_list_filter(self, request):
+        return (ShardListFilter,) + tuple(super().get_list_filter(request))
+    
+    def get_shard(self, request, object_id=None):
+        alias = request.GET.get('shard') or QueryDict(request.GET.get('_changelist_filters', '')).get('shard')
+        aliases = get_shard_aliases()
+        return alias if alias in aliases else aliases[0]
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Users live on the default database, so authors are matched by
+        # email there and their ids looked up on the shard.
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            user_ids = User.objects.filter(email__icontains=search_term).values_list('pk', flat=True)
+            results |= queryset.filter(user_id__in=list(user_ids))
+        return results, may_have_duplicates
+    
+    def changelist_view(self, request, extra_context=None):
+        with pin_shard(self.get_shard(request)):
+            return super().changelist_view(request, extra_context)
+    
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        with pin_shard(self.get_shard(request, object_id)):
+            return super().changeform_view(request, object_id, form_url, extra_context)
+    
+    def delete_view(self, request, object_id, extra_context=None):
+        with pin_shard(self.get_shard(request, object_id)):
+            return super().delete_view(request, object_id, extra_context)
+    
+    def history_view(self, request, object_id, extra_context=None):
+        with pin_shard(self.get_shard(request, object_id)):
+            return super().history_view(request, object_id, extra_context)
 
 
 @admin.register(User)
@@ -26,26 +89,47 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ShardedModelAdmin):
     list_display = ('id', 'user', 'description_preview', 'created_at', 'likes_count', 'dislikes_count')
     list_filter = ('created_at', 'user')
-    search_fields = ('description', 'user__email')
+    search_fields = ('description',)
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at', 'likes_count', 'dislikes_count')
     
+    def get_readonly_fields(self, request, obj=None):
+        # The author decides the shard and the directory entry of a post, so
+        # it cannot change once the post exists.
+        if obj is not None:
+            return self.readonly_fields + ('user',)
+        return self.readonly_fields
+    
+    def get_shard(self, request, object_id=None):
+        # Post ids are unique across shards, so a post opens on its own shard
+        # whichever shard's list it was reached from.
+        object_id = unquote(object_id) if object_id else ''
+        alias = shard_for_post(int(object_id)) if object_id.isdigit() else None
+        return alias or super().get_shard(request)
+    
     def description_preview(self, obj):
         return obj.description[:50] + '...' if len(obj.description) > 50 else obj.description
     description_preview.short_description = 'Description'
 
 
 @admin.register(Reaction)
-class ReactionAdmin(admin.ModelAdmin):
+class ReactionAdmin(ShardedModelAdmin):
     """Admin configuration for Reaction model"""
     
     list_display = ('id', 'user', 'post', 'reaction_type', 'created_at')
     list_filter = ('is_like', 'created_at')
-    search_fields = ('user__email', 'post__description')
+    search_fields = ('post__description',)
     ordering = ('-created_at',)
+    readonly_fields = ('user', 'post')
+    list_select_related = ('post',)
+    
+    def has_add_permission(self, request):
+        # Reactions are created through the API; the post choices would
+        # have to be gathered from every shard.
+        return False
     
     def reaction_type(self, obj):
         """Display Like or Dislike"""
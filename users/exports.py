@@ -0,0 +1,92 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Post, Reaction
+from .sharding import get_shard_aliases
+
+
+EXPORT_TABLES = {
+    'posts': (Post, ('id', 'user_id', 'description', 'image', 'created_at', 'updated_at')),
+    'reactions': (Reaction, ('id', 'user_id', 'post_id', 'is_like', 'created_at')),
+}
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Post ids are issued by the directory on the default database and are unique
+# across shards. Reaction ids are only unique within a shard.
+GLOBAL_ID_TABLES = {'posts'}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError('since must be an ISO 8601 datetime')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.get_default_timezone())
+    return since
+
+
+def has_global_watermark(table, database=None):
+    # Whether the highest exported id can be used as after_id for the next
+    # run. For reactions spread over several shards it cannot: an id from one
+    # shard would skip unrelated rows on the others.
+    return table in GLOBAL_ID_TABLES or bool(database) or len(get_shard_aliases()) == 1
+
+
+def check_after_id(table, after_id, database=None):
+    if after_id is not None and not has_global_watermark(table, database):
+        raise ValueError(f'after_id on {table} requires a database, since ids are only unique within a shard')
+
+
+def export_rows(table, since=None, after_id=None, chunk_size=DEFAULT_CHUNK_SIZE, database=None):
+    # Rows are read through iterator() so PostgreSQL uses a server-side
+    # cursor and only one chunk is held in memory at a time. Ordering by id
+    # makes the last exported id a valid watermark for the next run. Shards
+    # are exported one after another.
+    check_after_id(table, after_id, database)
+    model, fields = EXPORT_TABLES[table]
+    for alias in [database] if database else get_shard_aliases():
+        queryset = model.objects.using(alias)
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        if after_id is not None:
+            queryset = queryset.filter(id__gt=after_id)
+        rows = queryset.order_by('id').values_list(*fields).iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield dict(zip(fields, row))
+
+
+def export_value(value):
+    # Both formats write full isoformat() timestamps, so a created_at taken
+    # from either can be passed back as `since` without losing microseconds.
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps({name: export_value(value) for name, value in row.items()}, cls=DjangoJSONEncoder) + '\n'
+
+
+def render_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([export_value(value) for value in row.values()])
+
+
+def render_export(table, output, **kwargs):
+    rows = export_rows(table, **kwargs)
+    if output == 'csv':
+        return render_csv(rows, EXPORT_TABLES[table][1])
+    return render_ndjson(rows)
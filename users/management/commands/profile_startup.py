@@ -0,0 +1,138 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Loading the URLconf pulls in DRF, simplejwt and the views, which a worker
+# would otherwise only import when its first request arrives.
+IMPORT_SCRIPT = '''
+import social_network.wsgi
+from django.urls import get_resolver
+get_resolver().url_patterns
+'''
+
+FIRST_RESPONSE_SCRIPT = '''
+import io, json, sys, time
+start = time.perf_counter()
+from social_network.wsgi import application
+from users.warmup import prime_database_connections
+prime_database_connections()
+ready = time.perf_counter()
+from django.conf import settings
+from wsgiref.util import setup_testing_defaults
+method, path, data, token = sys.argv[1:5]
+host = next(
+    (h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')),
+    'localhost'
+)
+body = data.encode()
+environ = {
+    'REQUEST_METHOD': method,
+    'PATH_INFO': path,
+    'HTTP_HOST': host,
+    'CONTENT_TYPE': 'application/json',
+    'CONTENT_LENGTH': str(len(body)),
+    'wsgi.input': io.BytesIO(body),
+}
+if token:
+    environ['HTTP_AUTHORIZATION'] = 'Bearer ' + token
+setup_testing_defaults(environ)
+statuses = []
+b''.join(application(environ, lambda status, headers: statuses.append(status)))
+done = time.perf_counter()
+print(json.dumps({
+    'status': statuses[0],
+    'startup': ready - start,
+    'first_response': done - ready,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Report the import-time breakdown of a WSGI worker and benchmark its time to first response.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Number of packages to list.')
+        parser.add_argument('--method', default='POST', help='HTTP method of the first request.')
+        parser.add_argument('--path', default='/api/signup/', help='Path requested for the first response.')
+        parser.add_argument(
+            '--data',
+            default='{"email": "benchmark@example.com"}',
+            help=(
+                'JSON body of the first request. The default incomplete signup is allowed '
+                'anonymously, runs serializer validation and queries the database without '
+                'spending time on password hashing.'
+            )
+        )
+        parser.add_argument('--token', default='', help='Access token to send as a Bearer token, for authenticated paths.')
+        parser.add_argument('--repeat', type=int, default=5, help='Cold starts per benchmark variant.')
+        parser.add_argument('--skip-benchmark', action='store_true')
+
+    def run_python(self, args, warmup):
+        # Each cold start gets its own in-process cache so throttle buckets in
+        # a shared cache cannot turn later runs into 429s, and load shedding
+        # is off so only start-up cost is measured.
+        env = dict(
+            os.environ,
+            WARMUP_ON_STARTUP=str(warmup),
+            CACHE_BACKEND='django.core.cache.backends.locmem.LocMemCache',
+            LOAD_SHEDDING_ENABLED='False',
+        )
+        result = subprocess.run(
+            [sys.executable, *args],
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip())
+        return result
+
+    def handle(self, *args, **options):
+        self.report_imports(options['top'])
+        if not options['skip_benchmark']:
+            self.benchmark(options, options['repeat'])
+
+    def report_imports(self, top):
+        result = self.run_python(['-X', 'importtime', '-c', IMPORT_SCRIPT], warmup=False)
+
+        totals = defaultdict(int)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|')
+            totals[name.strip().split('.')[0]] += int(self_us)
+
+        overall = sum(totals.values())
+        self.stdout.write(f'Import time for social_network.wsgi and its URLconf: {overall / 1000:.1f} ms')
+        self.stdout.write(f"{'package':<32}{'ms':>10}{'share':>8}")
+        for package, micros in sorted(totals.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f'{package:<32}{micros / 1000:>10.1f}{micros / overall:>8.0%}')
+
+    def benchmark(self, options, repeat):
+        request_args = [options['method'].upper(), options['path'], options['data'], options['token']]
+        self.stdout.write('')
+        self.stdout.write(
+            f"Time to first response for {request_args[0]} {request_args[1]} (median of {repeat} cold starts)"
+        )
+        self.stdout.write(f"{'warm-up':<10}{'startup ms':>12}{'first req ms':>14}{'total ms':>10}  status")
+        for warmup in (False, True):
+            runs = [
+                json.loads(self.run_python(['-c', FIRST_RESPONSE_SCRIPT, *request_args], warmup).stdout)
+                for _ in range(repeat)
+            ]
+            startup = statistics.median(run['startup'] for run in runs) * 1000
+            first = statistics.median(run['first_response'] for run in runs) * 1000
+            total = statistics.median(run['startup'] + run['first_response'] for run in runs) * 1000
+            statuses = sorted({run['status'] for run in runs})
+            label = 'on' if warmup else 'off'
+            self.stdout.write(
+                f"{label:<10}{startup:>12.1f}{first:>14.1f}{total:>10.1f}  {', '.join(statuses)}"
+            )
+            if len(statuses) > 1:
+                self.stderr.write(f'Runs with warm-up {label} got different responses; the timings are not comparable.')
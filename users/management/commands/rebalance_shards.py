@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from users.models import Post, PostDirectory, Reaction
+from users.sharding import get_shard_aliases, shard_for_user
+
+
+class Command(BaseCommand):
+    help = (
+        'Move posts and their reactions to the shard their author hashes to. '
+        'Post ids are kept; moved reactions get new ids on the target shard.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        # Retired shards are still configured so they can be drained, but no
+        # author hashes to them any more.
+        aliases = get_shard_aliases()
+        sources = aliases + [
+            alias for alias in getattr(settings, 'RETIRED_SHARD_DATABASES', [])
+            if alias not in aliases
+        ]
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        moved_posts = 0
+        for source in sources:
+            author_ids = Post.objects.using(source).order_by().values_list('user_id', flat=True).distinct()
+            for author_id in list(author_ids):
+                self.sync_directory(author_id, source, batch_size, options['dry_run'])
+                target = shard_for_user(author_id, aliases)
+                if target == source:
+                    continue
+                if options['dry_run']:
+                    count = Post.objects.using(source).filter(user_id=author_id).count()
+                    self.stdout.write(f'Would move {count} posts of user {author_id}: {source} -> {target}')
+                    moved_posts += count
+                    continue
+                moved_posts += self.move_author(author_id, source, target, batch_size)
+
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {moved_posts} posts'))
+
+    def sync_directory(self, author_id, source, batch_size, dry_run):
+        # for_post() finds a post's shard through the author recorded in the
+        # directory, so it has to agree with the author the post is moved by.
+        post_ids = list(
+            Post.objects.using(source).filter(user_id=author_id).order_by('id').values_list('id', flat=True)
+        )
+        fixed = 0
+        for start in range(0, len(post_ids), batch_size):
+            stale = PostDirectory.objects.filter(pk__in=post_ids[start:start + batch_size]).exclude(user_id=author_id)
+            fixed += stale.count() if dry_run else stale.update(user_id=author_id)
+        if fixed:
+            verb = 'Would fix' if dry_run else 'Fixed'
+            self.stdout.write(f'{verb} {fixed} directory entries of user {author_id} on {source}')
+
+    def move_author(self, author_id, source, target, batch_size):
+        moved = 0
+        while True:
+            post_ids = list(
+                Post.objects.using(source)
+                .filter(user_id=author_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not post_ids:
+                return moved
+
+            # Copy first and delete second: if the run is interrupted the
+            # post exists on both shards, and the next run skips the copy.
+            with transaction.atomic(using=target):
+                already_copied = set(
+                    Post.objects.using(target).filter(pk__in=post_ids).values_list('id', flat=True)
+                )
+                posts = [
+                    post for post in Post.objects.using(source).filter(pk__in=post_ids)
+                    if post.pk not in already_copied
+                ]
+                reactions = list(
+                    Reaction.objects.using(source).filter(post_id__in=[post.pk for post in posts])
+                )
+                # Reaction ids are only unique within a shard, so the moved
+                # reactions get fresh ids from the target's sequence.
+                for reaction in reactions:
+                    reaction.pk = None
+                self.copy(Post, posts, target, ['created_at', 'updated_at'])
+                self.copy(Reaction, reactions, target, ['created_at'])
+
+            with transaction.atomic(using=source):
+                Post.objects.using(source).filter(pk__in=post_ids).delete()
+
+            moved += len(post_ids)
+            self.stdout.write(f'Moved {len(post_ids)} posts of user {author_id}: {source} -> {target}')
+
+    def copy(self, model, objs, using, timestamp_fields):
+        # bulk_create() re-applies auto_now/auto_now_add, so restore the
+        # original timestamps afterwards.
+        if not objs:
+            return
+        timestamps = [[getattr(obj, name) for name in timestamp_fields] for obj in objs]
+        created = model.objects.using(using).bulk_create(objs)
+        for obj, values in zip(created, timestamps):
+            for name, value in zip(timestamp_fields, values):
+                setattr(obj, name, value)
+        model.objects.using(using).bulk_update(created, timestamp_fields)
@@ -0,0 +1,18 @@
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .throttling import db_latency
+
+
+class DatabaseLatencyMiddleware:
+    # Feeds the duration of every query into the load shedding monitor.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(db_latency))
+            return self.get_response(request)
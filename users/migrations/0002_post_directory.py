@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, migrations, models
+
+
+def backfill_post_directory(apps, schema_editor):
+    # Existing posts all live on the default database; register them so
+    # their ids keep resolving, then move the id sequence past them.
+    connection = schema_editor.connection
+    if connection.alias != DEFAULT_DB_ALIAS:
+        return
+    Post = apps.get_model('users', 'Post')
+    PostDirectory = apps.get_model('users', 'PostDirectory')
+    PostDirectory.objects.using(connection.alias).bulk_create(
+        PostDirectory(id=post_id, user_id=user_id)
+        for post_id, user_id in Post.objects.using(connection.alias).values_list('id', 'user_id').iterator()
+    )
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [PostDirectory]):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='reaction',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='PostDirectory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Post directory entry',
+                'verbose_name_plural': 'Post directory',
+            },
+        ),
+        migrations.RunPython(backfill_post_directory, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager
+from .sharding import get_shard_aliases, shard_for_post, shard_for_user
 
 
 class User(AbstractUser):
@@ -23,16 +24,90 @@ class User(AbstractUser):
         verbose_name_plural = 'Users'
 
 
+class PostDirectory(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    
+    class Meta:
+        verbose_name = 'Post directory entry'
+        verbose_name_plural = 'Post directory'
+
+
+class ShardedQuerySet(models.QuerySet):
+    # Querysets of sharded models must be pinned to a shard before they run.
+    # create()/get_or_create()/update_or_create() pick the shard from the
+    # author or post they are given; anything else goes through for_author(),
+    # for_post(), on_shards() or using().
+    
+    def for_author(self, user_id):
+        return self.using(shard_for_user(user_id))
+    
+    def for_post(self, post_id):
+        alias = shard_for_post(post_id)
+        if alias is None:
+            return self.using(get_shard_aliases()[0]).none()
+        return self.using(alias)
+    
+    def on_shards(self):
+        return [self.using(alias) for alias in get_shard_aliases()]
+    
+    def _shard_for_values(self, values):
+        if self.model._meta.label == 'users.Post':
+            user = values.get('user')
+            user_id = user.pk if user is not None else values.get('user_id')
+            return shard_for_user(user_id) if user_id is not None else None
+        
+        post = values.get('post')
+        if post is not None:
+            return post._state.db or shard_for_user(post.user_id)
+        post_id = values.get('post_id')
+        if post_id is not None:
+            return shard_for_post(post_id)
+        return None
+    
+    def _routed(self, values):
+        if self._db is not None:
+            return self
+        alias = self._shard_for_values(values)
+        return self if alias is None else self.using(alias)
+    
+    def create(self, **kwargs):
+        return super(ShardedQuerySet, self._routed(kwargs)).create(**kwargs)
+    
+    def get_or_create(self, defaults=None, **kwargs):
+        return super(ShardedQuerySet, self._routed(kwargs)).get_or_create(defaults, **kwargs)
+    
+    def update_or_create(self, defaults=None, create_defaults=None, **kwargs):
+        return super(ShardedQuerySet, self._routed(kwargs)).update_or_create(
+            defaults, create_defaults, **kwargs
+        )
+
+
 class Post(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts', db_constraint=False)
     description = models.TextField(max_length=500)
     image = models.ImageField(upload_to='post_images/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ShardedQuerySet.as_manager()
+    
     def __str__(self):
         return f"Post by {self.user.email} - {self.created_at}"
     
+    def save(self, *args, **kwargs):
+        # Ids come from the directory on the default database so they stay
+        # unique across shards and can be mapped back to the author's shard.
+        if self.pk is None:
+            self.pk = PostDirectory.objects.create(user_id=self.user_id).pk
+            kwargs['force_insert'] = True
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        PostDirectory.objects.filter(pk=pk).delete()
+        return result
+    
     @property
     def likes_count(self):
         return self.reactions.filter(is_like=True).count()
@@ -48,11 +123,13 @@ class Post(models.Model):
 
 
 class Reaction(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reactions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reactions', db_constraint=False)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='reactions')
     is_like = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ShardedQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('user', 'post')
         verbose_name = 'Reaction'
@@ -93,7 +93,7 @@ class PostSerializer(serializers.ModelSerializer):
     def get_user_reaction(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            reaction = Reaction.objects.filter(user=request.user, post=obj).first()
+            reaction = obj.reactions.filter(user=request.user).first()
             if reaction:
                 return 'like' if reaction.is_like else 'dislike'
         return None
@@ -113,6 +113,9 @@ class PostSerializer(serializers.ModelSerializer):
         if not value or not value.strip():
             raise serializers.ValidationError("Description cannot be empty.")
         return value
+    
+    def create(self, validated_data):
+        return Post.objects.for_author(validated_data['user'].pk).create(**validated_data)
 
 
 class ReactionSerializer(serializers.ModelSerializer):
@@ -120,3 +123,15 @@ class ReactionSerializer(serializers.ModelSerializer):
         model = Reaction
         fields = ('id', 'user', 'post', 'is_like', 'created_at')
         read_only_fields = ('id', 'user', 'created_at')
+
+
+class PostReactionStateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    likes_count = serializers.IntegerField(source='likes')
+    dislikes_count = serializers.IntegerField(source='dislikes')
+    user_reaction = serializers.SerializerMethodField()
+    
+    def get_user_reaction(self, obj):
+        if obj['own_is_like'] is None:
+            return None
+        return 'like' if obj['own_is_like'] else 'dislike'
@@ -0,0 +1,133 @@
+import hashlib
+import heapq
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Posts live on the shard of their author and reactions live next to the
+# post they belong to, so a post, its counts and its reactions can always be
+# read from a single database. Every other model stays on the default alias.
+SHARDED_MODELS = {'users.Post', 'users.Reaction'}
+
+_pinned_shard = ContextVar('pinned_shard', default=None)
+
+
+class ShardRoutingError(Exception):
+    pass
+
+
+def get_shard_aliases():
+    return list(getattr(settings, 'SHARD_DATABASES', None) or [DEFAULT_DB_ALIAS])
+
+
+def shard_for_user(user_id, aliases=None):
+    # Rendezvous hashing: adding or removing a shard only moves the users
+    # whose highest-scoring alias changed, not everyone.
+    aliases = aliases or get_shard_aliases()
+    if len(aliases) == 1:
+        return aliases[0]
+    return max(
+        aliases,
+        key=lambda alias: hashlib.md5(f'{alias}:{user_id}'.encode()).digest()
+    )
+
+
+def shard_for_post(post_id):
+    from .models import PostDirectory
+
+    author_id = PostDirectory.objects.filter(pk=post_id).values_list('user_id', flat=True).first()
+    return None if author_id is None else shard_for_user(author_id)
+
+
+@contextmanager
+def pin_shard(alias):
+    # Sends queries on sharded models that carry no routing hint to `alias`
+    # for the duration of the block, for code that asks the router without
+    # an instance (e.g. the admin's change and delete views).
+    token = _pinned_shard.set(alias)
+    try:
+        yield
+    finally:
+        _pinned_shard.reset(token)
+
+
+def merge_by_recency(querysets, limit=None):
+    # Scatter-gather for the chronological feed: each shard returns its rows
+    # newest first and the lists are merged without re-sorting everything.
+    merged = heapq.merge(
+        *querysets,
+        key=lambda obj: (obj.created_at, obj.pk),
+        reverse=True
+    )
+    return list(islice(merged, limit))
+
+
+class ShardRouter:
+
+    def _db_for_model(self, model, write, **hints):
+        if model._meta.label not in SHARDED_MODELS:
+            return DEFAULT_DB_ALIAS
+
+        aliases = get_shard_aliases()
+        if len(aliases) == 1:
+            return aliases[0]
+
+        instance = hints.get('instance')
+        alias = self._shard_for_instance(model, instance) or _pinned_shard.get()
+        if alias is None:
+            if write and instance is not None:
+                # Assigning a user to a new reaction asks for a provisional
+                # database; saving it routes again by its post.
+                return None
+            # Falling back to the default alias would silently read or write
+            # the wrong shard, so unrouted queries are an error.
+            raise ShardRoutingError(
+                f'Cannot choose a shard for {model._meta.label}; use for_author(), '
+                f'for_post(), on_shards() or using().'
+            )
+        return alias
+
+    def _shard_for_instance(self, model, instance):
+        if instance is None:
+            return None
+
+        label = instance._meta.label
+        if label == 'users.Reaction':
+            post_field = instance._meta.get_field('post')
+            if post_field.is_cached(instance) and instance.post is not None:
+                return self._shard_for_instance(model, instance.post)
+            if not instance._state.adding:
+                return instance._state.db
+            if instance.post_id is not None:
+                return shard_for_post(instance.post_id)
+            return None
+        if label == 'users.Post':
+            return instance._state.db or shard_for_user(instance.user_id)
+        if label == settings.AUTH_USER_MODEL and model._meta.label == 'users.Post':
+            return shard_for_user(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._db_for_model(model, write=False, **hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db_for_model(model, write=True, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Users and the post directory stay on the default alias while posts
+        # and reactions are spread across shards, so relations between them
+        # are expected to cross databases.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards only hold the sharded tables; everything else, including the
+        # users they point at, is created on the default database alone.
+        if db == DEFAULT_DB_ALIAS:
+            return None
+        if model_name is None:
+            return None if app_label == 'users' else False
+        return f'{app_label}.{model_name}' in {label.lower() for label in SHARDED_MODELS}
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Post, Reaction
+from .sharding import get_shard_aliases
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def delete_sharded_content(sender, instance, **kwargs):
+    # The ORM cascade only reaches the database the user was deleted from.
+    for alias in get_shard_aliases():
+        Reaction.objects.using(alias).filter(user_id=instance.pk).delete()
+        Post.objects.using(alias).filter(user_id=instance.pk).delete()
@@ -1,3 +1,529 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from itertools import count
+from unittest import mock
+from urllib.parse import quote
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import User, Post, Reaction
+from .sharding import ShardRouter, ShardRoutingError, shard_for_user
+from .throttling import DatabaseLatencyMonitor, TokenBucketThrottle, db_latency
+from .warmup import prime_database_connections, prime_serializers, prime_url_resolver, warm_up
+
+
+class APITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME='localhost')
+
+    def create_user(self, email, **extra_fields):
+        return User.objects.create_user(email, 'password', full_name=email.split('@')[0], **extra_fields)
+
+
+class PostReactionStateTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user('author@example.com')
+        self.reader = self.create_user('reader@example.com')
+        self.posts = [
+            Post.objects.create(user=self.author, description=f'post {i}')
+            for i in range(100)
+        ]
+        Reaction.objects.create(user=self.reader, post=self.posts[0], is_like=True)
+        Reaction.objects.create(user=self.author, post=self.posts[0], is_like=False)
+        self.client.force_authenticate(self.reader)
+
+    def get_states(self, posts):
+        ids = ','.join(str(post.pk) for post in posts)
+        return self.client.get(f'/api/posts/reactions/?ids={ids}')
+
+    def test_returns_counts_and_own_reaction(self):
+        response = self.get_states(self.posts[:2])
+
+        self.assertEqual(response.status_code, 200)
+        states = {state['id']: state for state in response.json()}
+        self.assertEqual(states[self.posts[0].pk], {
+            'id': self.posts[0].pk,
+            'likes_count': 1,
+            'dislikes_count': 1,
+            'user_reaction': 'like',
+        })
+        self.assertIsNone(states[self.posts[1].pk]['user_reaction'])
+
+    def test_query_count_does_not_depend_on_number_of_ids(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_states(self.posts[:1]).status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.get_states(self.posts)
+        self.assertEqual(len(response.json()), 100)
+
+    def test_rejects_invalid_ids(self):
+        for ids in ('abc', '1,x', '99999999999999999999', '0', '-5', ''):
+            with self.subTest(ids=ids):
+                response = self.client.get(f'/api/posts/reactions/?ids={ids}')
+                self.assertEqual(response.status_code, 400)
+
+    def test_rejects_too_many_ids(self):
+        ids = ','.join(str(i) for i in range(1, 102))
+        response = self.client.get(f'/api/posts/reactions/?ids={ids}')
+        self.assertEqual(response.status_code, 400)
+
+
+class ReactionToggleTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('user@example.com')
+        self.post = Post.objects.create(user=self.user, description='hello')
+        self.client.force_authenticate(self.user)
+
+    def test_like_and_dislike_return_resulting_reaction(self):
+        like_url = f'/api/posts/{self.post.pk}/like/'
+        dislike_url = f'/api/posts/{self.post.pk}/dislike/'
+
+        self.assertEqual(self.client.post(like_url).json()['user_reaction'], 'like')
+        response = self.client.post(dislike_url).json()
+        self.assertEqual(response['user_reaction'], 'dislike')
+        self.assertEqual((response['likes_count'], response['dislikes_count']), (0, 1))
+        self.assertIsNone(self.client.post(dislike_url).json()['user_reaction'])
+
+
+class ThrottlingTests(APITestCase):
+    rates = {
+        'reaction': '3/min',
+        'reaction_ip': '5/min',
+        'login_ip': '2/min',
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1000.0
+        patchers = [
+            mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', self.rates),
+            mock.patch.object(TokenBucketThrottle, 'timer', mock.Mock(side_effect=lambda: self.now)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = self.create_user('user@example.com')
+        self.other = self.create_user('other@example.com')
+        self.post = Post.objects.create(user=self.user, description='hello')
+        self.like_url = f'/api/posts/{self.post.pk}/like/'
+
+    def like(self, user, ip='10.0.0.1'):
+        self.client.force_authenticate(user)
+        return self.client.post(self.like_url, REMOTE_ADDR=ip)
+
+    def test_allows_burst_up_to_capacity_then_throttles(self):
+        for _ in range(3):
+            self.assertEqual(self.like(self.user).status_code, 200)
+
+        response = self.like(self.user)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '20')
+
+    def test_bucket_refills_over_time(self):
+        for _ in range(3):
+            self.like(self.user)
+        self.now += 19
+        self.assertEqual(self.like(self.user).status_code, 429)
+        self.now += 1
+        self.assertEqual(self.like(self.user).status_code, 200)
+        self.assertEqual(self.like(self.user).status_code, 429)
+
+    def test_user_buckets_are_separate_but_share_the_ip_bucket(self):
+        for _ in range(3):
+            self.assertEqual(self.like(self.user).status_code, 200)
+        self.assertEqual(self.like(self.user).status_code, 429)
+
+        self.assertEqual(self.like(self.other).status_code, 200)
+        self.assertEqual(self.like(self.other).status_code, 429)
+        self.assertEqual(self.like(self.other, ip='10.0.0.2').status_code, 200)
+
+    def test_anonymous_views_use_the_ip_bucket(self):
+        payload = {'email': 'user@example.com', 'password': 'password'}
+        for _ in range(2):
+            response = self.client.post('/api/login/', payload, REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.post('/api/login/', payload, REMOTE_ADDR='10.0.0.1').status_code, 429)
+        self.assertEqual(self.client.post('/api/login/', payload, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_allows_request_without_a_token_when_bucket_lock_is_held(self):
+        for _ in range(2):
+            self.like(self.user)
+        lock_key = 'token_bucket_reaction_user_%s_lock' % self.user.pk
+        cache.set(lock_key, 1)
+        with mock.patch.object(TokenBucketThrottle, 'lock_retry_delay', 0):
+            self.assertEqual(self.like(self.user).status_code, 200)
+        cache.delete(lock_key)
+
+        self.assertEqual(self.like(self.user).status_code, 200)
+        self.assertEqual(self.like(self.user).status_code, 429)
+
+
+class LoadSheddingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('user@example.com')
+        self.post = Post.objects.create(user=self.user, description='hello')
+        self.client.force_authenticate(self.user)
+
+    def set_latency(self, seconds):
+        patcher = mock.patch.object(db_latency, 'current', return_value=seconds)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_low_priority_requests_are_shed_first(self):
+        self.set_latency(0.2)
+
+        response = self.client.post(f'/api/posts/{self.post.pk}/like/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertEqual(self.client.get(f'/api/posts/reactions/?ids={self.post.pk}').status_code, 200)
+        self.assertEqual(self.client.get('/api/posts/').status_code, 200)
+
+    def test_feed_is_never_shed(self):
+        self.set_latency(10)
+
+        self.assertEqual(self.client.get(f'/api/posts/reactions/?ids={self.post.pk}').status_code, 503)
+        self.assertEqual(self.client.get('/api/posts/').status_code, 200)
+
+    def test_requests_pass_when_latency_is_low(self):
+        self.set_latency(0.01)
+
+        self.assertEqual(self.client.post(f'/api/posts/{self.post.pk}/like/').status_code, 200)
+
+    def test_monitor_forgets_stale_samples(self):
+        monitor = DatabaseLatencyMonitor(sample_window=10)
+        monitor.record(5)
+        self.assertEqual(monitor.current(), 5)
+        with mock.patch('users.throttling.time.monotonic', return_value=monitor._updated_at + 60):
+            self.assertEqual(monitor.current(), 0.0)
+
+
+class WarmupTests(SimpleTestCase):
+    def fake_connections(self, **max_ages):
+        return {alias: mock.Mock(settings_dict={'CONN_MAX_AGE': age}) for alias, age in max_ages.items()}
+
+    def test_primes_only_persistent_connections(self):
+        connections = self.fake_connections(default=0, shard1=60, shard2=None)
+        with mock.patch('users.warmup.connections', connections):
+            prime_database_connections()
+
+        connections['default'].ensure_connection.assert_not_called()
+        connections['shard1'].ensure_connection.assert_called_once_with()
+        connections['shard2'].ensure_connection.assert_called_once_with()
+
+    @override_settings(WARMUP_ON_STARTUP=False)
+    def test_does_nothing_when_disabled(self):
+        connections = self.fake_connections(default=60)
+        with mock.patch('users.warmup.connections', connections), \
+                mock.patch('users.warmup.prime_url_resolver', autospec=True) as prime_url_resolver, \
+                mock.patch('users.warmup.prime_serializers', autospec=True) as prime_serializers:
+            prime_database_connections()
+            warm_up()
+
+        connections['default'].ensure_connection.assert_not_called()
+        prime_url_resolver.assert_not_called()
+        prime_serializers.assert_not_called()
+
+    def test_failures_are_logged_not_raised(self):
+        connections = self.fake_connections(default=60)
+        connections['default'].ensure_connection.side_effect = Exception('down')
+        with mock.patch('users.warmup.connections', connections), \
+                mock.patch('users.warmup.prime_url_resolver', autospec=True, side_effect=Exception('broken')), \
+                mock.patch('users.warmup.prime_serializers', autospec=True) as prime_serializers, \
+                self.assertLogs('users.warmup', 'WARNING') as logs:
+            prime_database_connections()
+            warm_up()
+
+        prime_serializers.assert_called_once_with()
+        self.assertEqual(len(logs.records), 2)
+
+    def test_warm_up_steps_run(self):
+        prime_url_resolver()
+        prime_serializers()
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_user('admin@example.com', is_staff=True)
+        self.author = self.create_user('author@example.com')
+        self.start = timezone.now().replace(microsecond=123456) - timedelta(days=3)
+        self.posts = []
+        for days in range(3):
+            post = Post.objects.create(user=self.author, description=f'post {days}')
+            Post.objects.for_author(self.author.pk).filter(pk=post.pk).update(
+                created_at=self.start + timedelta(days=days)
+            )
+            self.posts.append(Post.objects.for_author(self.author.pk).get(pk=post.pk))
+        self.reaction = Reaction.objects.create(user=self.admin, post=self.posts[0], is_like=False)
+        self.client.force_authenticate(self.admin)
+
+    def export(self, path):
+        response = self.client.get(f'/api/export/{path}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_rows_in_id_order(self):
+        lines = self.export('posts.ndjson').splitlines()
+
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [post.pk for post in self.posts])
+        self.assertEqual(rows[0]['user_id'], self.author.pk)
+        self.assertEqual(rows[0]['created_at'], self.posts[0].created_at.isoformat())
+
+    def test_csv_export_has_header_and_same_timestamps(self):
+        rows = list(csv.reader(StringIO(self.export('reactions.csv'))))
+
+        self.assertEqual(rows[0], ['id', 'user_id', 'post_id', 'is_like', 'created_at'])
+        self.assertEqual(rows[1][:4], [str(self.reaction.pk), str(self.admin.pk), str(self.posts[0].pk), 'False'])
+        self.assertEqual(rows[1][4], self.reaction.created_at.isoformat())
+        self.assertEqual(len(rows), 2)
+
+    def test_since_and_after_id_filter_rows(self):
+        since = quote(self.posts[1].created_at.isoformat())
+        rows = [json.loads(line) for line in self.export(f'posts.ndjson?since={since}').splitlines()]
+        self.assertEqual([row['id'] for row in rows], [post.pk for post in self.posts[1:]])
+
+        rows = [json.loads(line) for line in self.export(f'posts.ndjson?after_id={self.posts[1].pk}').splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.posts[2].pk])
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get('/api/export/users.ndjson').status_code, 404)
+        self.assertEqual(self.client.get('/api/export/posts.xml').status_code, 404)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson?since=yesterday').status_code, 400)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson?after_id=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson?database=nope').status_code, 400)
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson').status_code, 403)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson').status_code, 401)
+
+    def test_command_writes_rows_and_reports_watermark(self):
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch('sys.stdout', stdout):
+            call_command('export_data', 'posts', '--after-id', str(self.posts[0].pk), stderr=stderr)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [post.pk for post in self.posts[1:]])
+        self.assertIn(f'Highest exported id: {self.posts[2].pk}', stderr.getvalue())
+
+    def test_command_writes_csv_to_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reactions.csv')
+            stderr = StringIO()
+            call_command('export_data', 'reactions', '--format', 'csv', '--output', path, stderr=stderr)
+            with open(path, newline='') as output:
+                rows = list(csv.reader(output))
+
+        self.assertEqual([row[0] for row in rows], ['id', str(self.reaction.pk)])
+        self.assertIn(f'Highest exported id: {self.reaction.pk}', stderr.getvalue())
+
+    def test_command_rejects_bad_since(self):
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'posts', '--since', 'yesterday', stderr=StringIO())
+
+
+@override_settings(SHARD_DATABASES=['default', 'shard1', 'shard2'])
+class ShardingTests(APITestCase):
+    databases = {'default', 'shard1', 'shard2'}
+    aliases = ['default', 'shard1', 'shard2']
+
+    def setUp(self):
+        super().setUp()
+        self.user_numbers = count()
+        self.authors = {alias: self.create_user_on(alias) for alias in self.aliases}
+
+    def create_user_on(self, alias, retired=None):
+        # Hashing decides the shard, so create users until one lands on
+        # `alias` (and, if given, on `retired[1]` once `retired[0]` is gone).
+        for _ in range(200):
+            user = User.objects.create(email=f'user{next(self.user_numbers)}@example.com', full_name=alias)
+            placed = shard_for_user(user.pk, self.aliases) == alias
+            if placed and retired:
+                remaining = [name for name in self.aliases if name != retired[0]]
+                placed = shard_for_user(user.pk, remaining) == retired[1]
+            if placed:
+                return user
+            user.delete()
+        self.fail(f'No user hashed to {alias}')
+
+    def create_post(self, user, **fields):
+        return Post.objects.create(user=user, description=f'by {user.email}', **fields)
+
+    def test_posts_and_reactions_are_placed_by_author(self):
+        reader = self.authors['default']
+        for alias, author in self.authors.items():
+            with self.subTest(alias=alias):
+                post = self.create_post(author)
+                reaction, _ = Reaction.objects.get_or_create(user=reader, post_id=post.pk)
+                self.assertEqual(post._state.db, alias)
+                self.assertEqual(reaction._state.db, alias)
+                self.assertTrue(Post.objects.using(alias).filter(pk=post.pk).exists())
+                self.assertTrue(Reaction.objects.using(alias).filter(pk=reaction.pk).exists())
+                self.assertEqual(Post.objects.for_post(post.pk).get().pk, post.pk)
+
+    def test_post_ids_are_unique_across_shards(self):
+        posts = [self.create_post(author) for author in self.authors.values()]
+        self.assertEqual(len({post.pk for post in posts}), len(posts))
+
+    def test_unrouted_queries_raise(self):
+        with self.assertRaises(ShardRoutingError):
+            list(Post.objects.all())
+        with self.assertRaises(ShardRoutingError):
+            Reaction.objects.filter(is_like=True).count()
+
+    def test_like_and_dislike_use_the_posts_shard(self):
+        post = self.create_post(self.authors['shard2'])
+        self.client.force_authenticate(self.authors['shard1'])
+
+        self.assertEqual(self.client.post(f'/api/posts/{post.pk}/like/').json()['user_reaction'], 'like')
+        response = self.client.post(f'/api/posts/{post.pk}/dislike/').json()
+
+        self.assertEqual((response['likes_count'], response['dislikes_count']), (0, 1))
+        self.assertEqual(Reaction.objects.using('shard2').filter(post_id=post.pk, is_like=False).count(), 1)
+        self.assertEqual(self.client.post('/api/posts/999999/like/').status_code, 404)
+
+    def test_feed_merges_shards_newest_first(self):
+        now = timezone.now()
+        posts = []
+        for minutes, alias in enumerate(['shard1', 'default', 'shard2', 'shard1', 'default']):
+            post = self.create_post(self.authors[alias])
+            Post.objects.using(alias).filter(pk=post.pk).update(created_at=now - timedelta(minutes=minutes))
+            posts.append(post)
+        self.client.force_authenticate(self.authors['default'])
+
+        response = self.client.get('/api/posts/')
+
+        self.assertEqual([post['id'] for post in response.json()], [post.pk for post in posts])
+
+    def test_deleting_a_user_removes_their_content_on_every_shard(self):
+        author = self.authors['shard1']
+        own_post = self.create_post(author)
+        other_post = self.create_post(self.authors['shard2'])
+        Reaction.objects.create(user=author, post=other_post)
+        Reaction.objects.create(user=self.authors['shard2'], post=own_post)
+
+        author.delete()
+
+        self.assertFalse(Post.objects.using('shard1').filter(pk=own_post.pk).exists())
+        self.assertFalse(Reaction.objects.using('shard1').exists())
+        self.assertFalse(Reaction.objects.using('shard2').filter(user_id=author.pk).exists())
+        self.assertTrue(Post.objects.using('shard2').filter(pk=other_post.pk).exists())
+
+    def test_rebalance_drains_retired_shard(self):
+        author = self.create_user_on('default', retired=('default', 'shard2'))
+        post = self.create_post(author)
+        Reaction.objects.create(user=self.authors['shard1'], post=post, is_like=False)
+        created_at = post.created_at - timedelta(days=1)
+        Post.objects.using('default').filter(pk=post.pk).update(created_at=created_at)
+
+        with override_settings(SHARD_DATABASES=['shard1', 'shard2'], RETIRED_SHARD_DATABASES=['default']):
+            call_command('rebalance_shards', '--dry-run', stdout=StringIO())
+            self.assertTrue(Post.objects.using('default').filter(pk=post.pk).exists())
+
+            call_command('rebalance_shards', stdout=StringIO())
+
+            self.assertFalse(Post.objects.using('default').exists())
+            self.assertFalse(Reaction.objects.using('default').exists())
+            moved = Post.objects.for_post(post.pk).get()
+            self.assertEqual(moved._state.db, 'shard2')
+            self.assertEqual(moved.created_at, created_at)
+            self.assertEqual(list(moved.reactions.values_list('user_id', 'is_like')), [(self.authors['shard1'].pk, False)])
+
+    def test_rebalance_updates_directory_when_author_changed(self):
+        post = self.create_post(self.authors['shard1'])
+        new_author = self.authors['shard2']
+        Post.objects.using('shard1').filter(pk=post.pk).update(user_id=new_author.pk)
+
+        call_command('rebalance_shards', stdout=StringIO())
+
+        moved = Post.objects.for_post(post.pk).get()
+        self.assertEqual((moved._state.db, moved.user_id), ('shard2', new_author.pk))
+
+    def test_shards_only_hold_sharded_tables(self):
+        router = ShardRouter()
+        self.assertFalse(router.allow_migrate('shard1', 'users', model_name='user'))
+        self.assertFalse(router.allow_migrate('shard1', 'auth'))
+        self.assertTrue(router.allow_migrate('shard1', 'users', model_name='post'))
+        self.assertIsNone(router.allow_migrate('default', 'users', model_name='user'))
+        self.assertNotIn('users_user', connections['shard1'].introspection.table_names())
+        self.assertIn('users_reaction', connections['shard1'].introspection.table_names())
+
+    def test_reaction_export_requires_database_for_after_id(self):
+        admin = self.create_user('admin@example.com', is_staff=True)
+        self.client.force_authenticate(admin)
+
+        self.assertEqual(self.client.get('/api/export/reactions.ndjson?after_id=1').status_code, 400)
+        self.assertEqual(self.client.get('/api/export/reactions.ndjson?after_id=1&database=shard1').status_code, 200)
+        self.assertEqual(self.client.get('/api/export/posts.ndjson?after_id=1').status_code, 200)
+
+    def log_in_admin(self):
+        admin = self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+
+    def changelist_ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [obj.pk for obj in response.context['cl'].result_list]
+
+    def test_admin_lists_one_shard_at_a_time(self):
+        self.log_in_admin()
+        posts = {alias: self.create_post(author) for alias, author in self.authors.items()}
+
+        self.assertEqual(self.changelist_ids('/admin/users/post/'), [posts['default'].pk])
+        self.assertEqual(self.changelist_ids('/admin/users/post/?shard=shard2'), [posts['shard2'].pk])
+
+    def test_admin_searches_posts_and_reactions_by_author_email(self):
+        self.log_in_admin()
+        author = self.authors['shard1']
+        post = self.create_post(author)
+        reaction = Reaction.objects.create(user=author, post=post)
+
+        url = f'/admin/users/post/?shard=shard1&q={author.email}'
+        self.assertEqual(self.changelist_ids(url), [post.pk])
+        self.assertEqual(self.changelist_ids('/admin/users/post/?shard=shard1&q=nobody@'), [])
+        url = f'/admin/users/reaction/?shard=shard1&q={author.email}'
+        self.assertEqual(self.changelist_ids(url), [reaction.pk])
+
+    def test_admin_opens_reactions_on_the_listed_shard(self):
+        self.log_in_admin()
+        post = self.create_post(self.authors['shard2'])
+        reaction = Reaction.objects.create(user=self.authors['default'], post=post)
+
+        url = f'/admin/users/reaction/{reaction.pk}/change/?_changelist_filters=shard%3Dshard2'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['original'], reaction)
+
+    def test_admin_edits_and_deletes_posts_on_their_shard(self):
+        self.log_in_admin()
+        posts = [self.create_post(author) for author in self.authors.values()]
+
+        post = posts[2]
+        self.assertEqual(self.client.get(f'/admin/users/post/{post.pk}/change/').status_code, 200)
+        response = self.client.post(f'/admin/users/post/{post.pk}/change/', {
+            'user': self.authors['default'].pk,
+            'description': 'edited',
+        })
+        self.assertEqual(response.status_code, 302)
+        edited = Post.objects.for_post(post.pk).get()
+        self.assertEqual((edited.description, edited.user_id), ('edited', post.user_id))
+
+        response = self.client.post(f'/admin/users/post/{post.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Post.objects.using(post._state.db).filter(pk=post.pk).exists())
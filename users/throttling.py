@@ -0,0 +1,184 @@
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+class ServiceOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server is busy, please try again shortly.'
+    default_code = 'service_overloaded'
+
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+class DatabaseLatencyMonitor:
+    # Exponentially weighted moving average of query durations seen by this
+    # worker. Readings older than the sample window are ignored so the
+    # monitor recovers once traffic (and therefore sampling) calms down.
+
+    def __init__(self, smoothing=0.2, sample_window=10):
+        self.smoothing = smoothing
+        self.sample_window = sample_window
+        self._average = 0.0
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._updated_at > self.sample_window:
+                self._average = duration
+            else:
+                self._average += self.smoothing * (duration - self._average)
+            self._updated_at = now
+
+    def current(self):
+        with self._lock:
+            if time.monotonic() - self._updated_at > self.sample_window:
+                return 0.0
+            return self._average
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(time.monotonic() - start)
+
+
+def get_load_shedding_setting(name):
+    defaults = {
+        'ENABLED': True,
+        'THRESHOLDS_MS': {'low': 150, 'normal': 400},
+        'RETRY_AFTER': 5,
+        'SMOOTHING': 0.2,
+        'SAMPLE_WINDOW': 10,
+    }
+    return getattr(settings, 'LOAD_SHEDDING', {}).get(name, defaults[name])
+
+
+db_latency = DatabaseLatencyMonitor(
+    smoothing=get_load_shedding_setting('SMOOTHING'),
+    sample_window=get_load_shedding_setting('SAMPLE_WINDOW'),
+)
+
+
+class LoadSheddingThrottle(BaseThrottle):
+    # Rejects requests to views whose `load_shed_priority` has a latency
+    # threshold configured once recent DB latency crosses it. Views without
+    # a threshold for their priority (e.g. 'high') are never shed.
+    default_priority = 'normal'
+
+    def allow_request(self, request, view):
+        if not get_load_shedding_setting('ENABLED'):
+            return True
+
+        priority = getattr(view, 'load_shed_priority', self.default_priority)
+        threshold = get_load_shedding_setting('THRESHOLDS_MS').get(priority)
+        if threshold is None:
+            return True
+
+        if db_latency.current() * 1000 > threshold:
+            raise ServiceOverloaded(wait=get_load_shedding_setting('RETRY_AFTER'))
+        return True
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    # Token bucket keyed by `throttle_scope` on the view. A rate of 'N/period'
+    # allows bursts of up to N requests and refills at N per period. Bucket
+    # state lives in the default cache so it is shared between workers when
+    # a shared backend is configured. The read-modify-write of a bucket is
+    # guarded by a lock taken with cache.add(), which is atomic on the
+    # locmem, memcached and redis backends. Requests that cannot get the lock
+    # within a few milliseconds are let through without taking a token: a
+    # slow cache must not turn into 429s for clients that still have tokens.
+    cache_format = 'token_bucket_%(scope)s_%(ident)s'
+    rate_suffix = ''
+    lock_attempts = 5
+    lock_retry_delay = 0.002
+    lock_timeout = 1
+
+    def __init__(self):
+        # Rate is determined by the view's scope in allow_request().
+        pass
+
+    def get_rate(self):
+        return self.THROTTLE_RATES.get(self.scope + self.rate_suffix)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+
+        self.scope = scope
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity, duration = self.parse_rate(self.rate)
+        refill_rate = capacity / duration
+
+        lock_key = self.key + '_lock'
+        if not self.acquire_lock(lock_key):
+            return True
+
+        try:
+            now = self.timer()
+            tokens, updated_at = self.cache.get(self.key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            if tokens < 1:
+                self.wait_seconds = (1 - tokens) / refill_rate
+                allowed = False
+            else:
+                tokens -= 1
+                allowed = True
+
+            self.cache.set(self.key, (tokens, now), duration)
+        finally:
+            self.cache.delete(lock_key)
+        return allowed
+
+    def acquire_lock(self, lock_key):
+        for attempt in range(self.lock_attempts):
+            if self.cache.add(lock_key, 1, self.lock_timeout):
+                return True
+            if attempt < self.lock_attempts - 1:
+                time.sleep(self.lock_retry_delay)
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    # Uses the '<scope>' rate, for authenticated users only.
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': 'user_%s' % request.user.pk
+        }
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    # Uses the '<scope>_ip' rate, for every client address.
+    rate_suffix = '_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope + self.rate_suffix,
+            'ident': self.get_ident(request)
+        }
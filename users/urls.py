@@ -8,6 +8,8 @@ from .views import (
     PostDetailView,
     PostLikeView,
     PostDislikeView,
+    PostReactionStateView,
+    ExportView,
 )
 
 urlpatterns = [
@@ -16,7 +18,9 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('profile/', ProfileView.as_view(), name='profile'),
     path('posts/', PostListCreateView.as_view(), name='post-list-create'),
+    path('posts/reactions/', PostReactionStateView.as_view(), name='post-reaction-state'),
     path('posts/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
     path('posts/<int:pk>/like/', PostLikeView.as_view(), name='post-like'),
     path('posts/<int:pk>/dislike/', PostDislikeView.as_view(), name='post-dislike'),
+    path('export/<str:table>.<str:output>', ExportView.as_view(), name='export'),
 ]
@@ -3,19 +3,37 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Q, OuterRef, Subquery
 from .models import User, Post, Reaction
+from .sharding import get_shard_aliases, merge_by_recency
+from .exports import (
+    EXPORT_TABLES,
+    EXPORT_FORMATS,
+    DEFAULT_CHUNK_SIZE,
+    parse_since,
+    check_after_id,
+    render_export
+)
 from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
     PostSerializer,
-    ReactionSerializer
+    ReactionSerializer,
+    PostReactionStateSerializer
 )
 
 
+MAX_REACTION_STATE_IDS = 100
+MAX_POST_ID = 2 ** 63 - 1
+
+
 class SignupView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_scope = 'signup'
+    load_shed_priority = 'low'
     authentication_classes = ()
     
     def create(self, request, *args, **kwargs):
@@ -37,6 +55,8 @@ class SignupView(generics.CreateAPIView):
 
 class LoginView(APIView):
     permission_classes = (permissions.AllowAny,)
+    throttle_scope = 'login'
+    load_shed_priority = 'normal'
     authentication_classes = ()
     
     def post(self, request):
@@ -96,6 +116,12 @@ class PostListCreateView(generics.ListCreateAPIView):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    load_shed_priority = 'high'
+    
+    def get_queryset(self):
+        return merge_by_recency(
+            posts.order_by('-created_at', '-id') for posts in Post.objects.on_shards()
+        )
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -115,9 +141,10 @@ class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    load_shed_priority = 'high'
     
     def get_queryset(self):
-        return Post.objects.filter(user=self.request.user)
+        return Post.objects.for_author(self.request.user.pk).filter(user=self.request.user)
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -129,18 +156,19 @@ class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 class PostLikeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'reaction'
+    load_shed_priority = 'low'
     
     def post(self, request, pk):
         try:
-            post = Post.objects.get(pk=pk)
+            post = Post.objects.for_post(pk).get(pk=pk)
         except Post.DoesNotExist:
             return Response({
                 'error': 'Post not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        reaction, created = Reaction.objects.get_or_create(
+        reaction, created = post.reactions.get_or_create(
             user=request.user,
-            post=post,
             defaults={'is_like': True}
         )
         
@@ -148,34 +176,39 @@ class PostLikeView(APIView):
             if reaction.is_like:
                 reaction.delete()
                 message = 'Like removed'
+                user_reaction = None
             else:
                 reaction.is_like = True
                 reaction.save()
                 message = 'Changed to like'
+                user_reaction = 'like'
         else:
             message = 'Post liked'
+            user_reaction = 'like'
         
         return Response({
             'message': message,
             'likes_count': post.likes_count,
-            'dislikes_count': post.dislikes_count
+            'dislikes_count': post.dislikes_count,
+            'user_reaction': user_reaction
         }, status=status.HTTP_200_OK)
 
 
 class PostDislikeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'reaction'
+    load_shed_priority = 'low'
     
     def post(self, request, pk):
         try:
-            post = Post.objects.get(pk=pk)
+            post = Post.objects.for_post(pk).get(pk=pk)
         except Post.DoesNotExist:
             return Response({
                 'error': 'Post not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        reaction, created = Reaction.objects.get_or_create(
+        reaction, created = post.reactions.get_or_create(
             user=request.user,
-            post=post,
             defaults={'is_like': False}
         )
         
@@ -183,15 +216,112 @@ class PostDislikeView(APIView):
             if not reaction.is_like:
                 reaction.delete()
                 message = 'Dislike removed'
+                user_reaction = None
             else:
                 reaction.is_like = False
                 reaction.save()
                 message = 'Changed to dislike'
+                user_reaction = 'dislike'
         else:
             message = 'Post disliked'
+            user_reaction = 'dislike'
         
         return Response({
             'message': message,
             'likes_count': post.likes_count,
-            'dislikes_count': post.dislikes_count
+            'dislikes_count': post.dislikes_count,
+            'user_reaction': user_reaction
         }, status=status.HTTP_200_OK)
+
+
+class PostReactionStateView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'reaction_state'
+    load_shed_priority = 'normal'
+    
+    def get(self, request):
+        raw_ids = request.query_params.get('ids', '')
+        try:
+            ids = {int(value) for value in raw_ids.split(',') if value.strip()}
+            if any(not 0 < post_id <= MAX_POST_ID for post_id in ids):
+                raise ValueError
+        except ValueError:
+            return Response({
+                'error': 'ids must be a comma-separated list of post ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not ids:
+            return Response({
+                'error': 'Please provide at least one post id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(ids) > MAX_REACTION_STATE_IDS:
+            return Response({
+                'error': f'At most {MAX_REACTION_STATE_IDS} post ids can be requested at once'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        own_reaction = Reaction.objects.filter(
+            user=request.user,
+            post=OuterRef('pk')
+        ).values('is_like')[:1]
+        
+        states = []
+        for posts in Post.objects.on_shards():
+            states.extend(posts.filter(pk__in=ids).annotate(
+                likes=Count('reactions', filter=Q(reactions__is_like=True)),
+                dislikes=Count('reactions', filter=Q(reactions__is_like=False)),
+                own_is_like=Subquery(own_reaction)
+            ).order_by().values('id', 'likes', 'dislikes', 'own_is_like'))
+        
+        serializer = PostReactionStateSerializer(states, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    load_shed_priority = 'low'
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+    
+    def get(self, request, table, output):
+        if table not in EXPORT_TABLES or output not in EXPORT_FORMATS:
+            return Response({
+                'error': 'Unknown export'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        since = request.query_params.get('since')
+        after_id = request.query_params.get('after_id')
+        database = request.query_params.get('database')
+        if database and database not in get_shard_aliases():
+            return Response({
+                'error': 'Unknown database'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            since = parse_since(since) if since else None
+            after_id = int(after_id) if after_id else None
+        except ValueError:
+            return Response({
+                'error': 'since must be an ISO 8601 datetime and after_id an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            check_after_id(table, after_id, database)
+        except ValueError as exc:
+            return Response({
+                'error': str(exc)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(
+            render_export(
+                table,
+                output,
+                since=since,
+                after_id=after_id,
+                chunk_size=DEFAULT_CHUNK_SIZE,
+                database=database
+            ),
+            content_type=self.content_types[output]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{table}.{output}"'
+        return response
@@ -0,0 +1,66 @@
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, get_resolver, resolve
+
+logger = logging.getLogger(__name__)
+
+
+def prime_url_resolver():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    try:
+        resolve('/')
+    except Resolver404:
+        pass
+
+
+def prime_serializers():
+    from .serializers import (
+        UserRegistrationSerializer,
+        UserSerializer,
+        PostSerializer,
+        ReactionSerializer,
+        PostReactionStateSerializer
+    )
+    for serializer_class in (
+        UserRegistrationSerializer,
+        UserSerializer,
+        PostSerializer,
+        ReactionSerializer,
+        PostReactionStateSerializer,
+    ):
+        serializer_class().fields
+
+
+def prime_database_connections():
+    # Only persistent connections survive until the first request: with
+    # CONN_MAX_AGE=0 request_started closes them again. Connections are per
+    # thread, so this must run in the worker thread that serves requests and
+    # after any fork (e.g. from a gunicorn post_worker_init hook).
+    if not getattr(settings, 'WARMUP_ON_STARTUP', True):
+        return
+    for alias in connections:
+        connection = connections[alias]
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        if max_age is None or max_age > 0:
+            try:
+                connection.ensure_connection()
+            except Exception:
+                logger.warning('Could not open database connection %s', alias, exc_info=True)
+
+
+def warm_up():
+    # Called from the WSGI/ASGI entry points so the first request does not pay
+    # for URLconf/view imports or serializer field construction. This is safe
+    # to run before forking; database connections are primed separately by
+    # prime_database_connections(). Failures are logged rather than raised so
+    # a broken warm-up step does not stop the worker from booting.
+    if not getattr(settings, 'WARMUP_ON_STARTUP', True):
+        return
+    for step in (prime_url_resolver, prime_serializers):
+        try:
+            step()
+        except Exception:
+            logger.warning('Warm-up step %s failed', step.__name__, exc_info=True)